@@ -1,2 +1,3 @@
 from .types import Tensor
-from .guard import tensorguard, tensorcheck
\ No newline at end of file
+from .guard import tensorguard, tensorcheck
+from .stats import GuardStats
\ No newline at end of file
@@ -1,7 +1,10 @@
 from functools import wraps, partial
+from importlib import import_module
+from types import MethodType
 from termcolor import colored
 from collections import defaultdict
 from tensorguard.types import Tensor
+from tensorguard.stats import _default_stats
 from typeguard import _CallMemo
 class TensorMismatchError(Exception):
     pass
@@ -71,7 +74,7 @@ class ManualMemo:
 import torch as ch
 import numpy as np
 
-def tensorcheck(args, expected_types):
+def tensorcheck(args, expected_types, stats=None):
     def _massage_args(it, expected_types):
         if isinstance(it, list) or isinstance(it, tuple):
             assert len(expected_types) == len(it)
@@ -87,6 +90,7 @@ def tensorcheck(args, expected_types):
     args, expected_types = _massage_args(args, expected_types)
     memo = ManualMemo(args, expected_types)
     args_ok, processed = check_argument_types_and_generics(memo)
+    _record(stats, args_ok)
     argnames, hints, realized, conversion_errors, generics = processed 
     error_args = (argnames, generics, hints, realized, conversion_errors)
     if not args_ok:
@@ -95,12 +99,40 @@ def tensorcheck(args, expected_types):
 
     return args_ok
 
-def tensorguard(func):
-    def wrapper(*args, **kwargs):
+def _record(stats, ok):
+    # guards without their own stats count into the process default, if any
+    stats = stats if stats is not None else _default_stats()
+    if stats is not None:
+        stats.record(ok)
+
+def _lookup(module, qualname):
+    obj = import_module(module)
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+
+    return obj
+
+def _restore_guard(module, qualname, stats):
+    # worker side: import the guard by name instead of shipping the function;
+    # keep whatever stats the worker's own guard already has if none were sent
+    guard = _lookup(module, qualname)
+    if stats is not None:
+        guard.stats = stats
+
+    return guard
+
+class _TensorGuard:
+    def __init__(self, func, stats=None):
+        self.stats = stats
+        wraps(func)(self)
+
+    def __call__(self, *args, **kwargs):
+        func = self.__wrapped__
         memo = _CallMemo(func=func, args=args, kwargs=kwargs)
         args_ok, processed = check_argument_types_and_generics(memo)
         argnames, hints, realized, conversion_errors, generics = processed
         error_args = (argnames, generics, hints, realized, conversion_errors)
+        _record(self.stats, args_ok)
         if not args_ok:
             msg = error_msg(*error_args)
             raise TensorMismatchError(msg)
@@ -109,6 +141,9 @@ def tensorguard(func):
         ret_ok, (ret_hint, ret_realized) = check_return_type(retval, memo,
                                                            conversion_errors,
                                                            generics)
+        if isinstance(ret_hint, Tensor):
+            _record(self.stats, ret_ok)
+
         if not ret_ok:
             error_args = error_args + (ret_hint, ret_realized,)
             msg = error_msg(*error_args)
@@ -116,7 +151,32 @@ def tensorguard(func):
 
         return retval
 
-    return wraps(func)(wrapper)
+    def __get__(self, obj, objtype=None):
+        # behave like the wrapped function when used as a method
+        if obj is None:
+            return self
+
+        return MethodType(self, obj)
+
+    def __reduce__(self):
+        # module level guards pickle by reference, so workers just import
+        # them; anything else ships the function (with its lazy specs)
+        module, qualname = self.__module__, self.__qualname__
+        try:
+            by_ref = _lookup(module, qualname) is self
+        except (ImportError, AttributeError):
+            by_ref = False
+
+        if by_ref:
+            return (_restore_guard, (module, qualname, self.stats))
+
+        return (_TensorGuard, (self.__wrapped__, self.stats))
+
+def tensorguard(func=None, *, stats=None):
+    if func is None:
+        return partial(tensorguard, stats=stats)
+
+    return _TensorGuard(func, stats=stats)
 
 def _is_bad_generic(s):
     if _BAD_GENERIC in s or len(s) != 1:
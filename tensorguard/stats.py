@@ -0,0 +1,280 @@
+import os
+import sys
+import pickle
+import warnings
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.context import get_spawning_popen
+from multiprocessing.managers import BaseManager, AcquirerProxy
+
+# each row of the block: [pid, checks, failures]
+_PID, _CHECKS, _FAILURES = range(3)
+_ROW_WIDTH = 3
+# row 0 holds counts from processes that exited or found no free row
+_OVERFLOW = 0
+# a process that found no free row retries the claim every this many records
+_RECLAIM_EVERY = 256
+
+# attachments in this process, by block name, so unpickling is cheap
+_attached = {}
+# stats that guards and tensorcheck without their own stats record into
+_default = None
+
+def _default_stats():
+    return _default
+
+def _pid_alive(pid):
+    if sys.platform == 'win32':
+        # os.kill would terminate the process here; never reclaim
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+# the manager serves the owner's semaphore to processes that got the stats
+# outside of process start (e.g. inside a pool task), where it can't be pickled
+_server_lock = None
+
+def _set_server_lock(lock):
+    global _server_lock
+    _server_lock = lock
+
+def _get_server_lock():
+    return _server_lock
+
+class _LockManager(BaseManager):
+    pass
+
+_LockManager.register('lock', callable=_get_server_lock,
+                      proxytype=AcquirerProxy)
+
+def _attach(name, slots, lock, lock_state):
+    stats = _attached.get(name)
+    if stats is None:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            # the owner already closed the block; nothing left to count into
+            return None
+
+        stats = GuardStats.__new__(GuardStats)
+        stats._setup(slots, shm, False)
+
+    if stats._lock is None:
+        stats._lock = lock
+
+    if stats._lock_state is None:
+        stats._lock_state = lock_state
+
+    return stats
+
+def _forget_owned():
+    # forked children inherit the owner's objects but must not free the block
+    for stats in _attached.values():
+        stats._owner = False
+        stats._manager = None
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_owned)
+
+class GuardStats:
+    '''
+    Check/failure counters kept in a shared memory block so that guards
+    running in worker processes (DataLoader workers, multiprocessing pools)
+    report back to the parent. Each process claims a row (keyed by pid) under
+    a lock and is then its only writer; rows of exited processes are folded
+    into an overflow row and reused. Pickles by block name.
+
+    The lock is a semaphore inherited by forked workers and shipped to spawned
+    ones at start-up (see `worker_init`). The first time the stats are pickled
+    outside of process start-up, a manager server process is started to share
+    that semaphore; it is shut down by `close`.
+    '''
+    def __init__(self, slots=64):
+        assert slots > 0, f'slots ({slots}) should be a positive int'
+        size = (slots + 1) * _ROW_WIDTH * np.dtype(np.int64).itemsize
+        self._setup(slots, shared_memory.SharedMemory(create=True, size=size),
+                    True)
+        self._rows[:] = 0
+        self._lock = mp.get_context('spawn').Lock()
+
+    def _setup(self, slots, shm, owner):
+        self.slots = slots
+        self._shm = shm
+        self._owner = owner
+        self._rows = np.ndarray((slots + 1, _ROW_WIDTH), dtype=np.int64,
+                                buffer=shm.buf)
+        self._manager = self._lock = self._lock_state = None
+        self._row = self._row_pid = None
+        self._overflow_pid, self._overflow_records = None, 0
+        _attached[shm.name] = self
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def closed(self):
+        return self._rows is None
+
+    def _live_rows(self):
+        if self.closed:
+            raise ValueError('GuardStats is closed')
+
+        return self._rows
+
+    @property
+    def checks(self):
+        return int(self._live_rows()[:, _CHECKS].sum())
+
+    @property
+    def failures(self):
+        return int(self._live_rows()[:, _FAILURES].sum())
+
+    def per_process(self):
+        # {pid: (checks, failures)} for processes that still hold a row
+        rows = self._live_rows()[_OVERFLOW + 1:]
+        rows = rows[rows[:, _PID] != 0]
+        return {int(p): (int(c), int(f)) for p, c, f in rows}
+
+    def worker_init(self, *args):
+        '''
+        Make these stats the default for guards (and tensorcheck calls) in
+        this process that have no stats of their own. Pass as a Pool
+        `initializer` or DataLoader `worker_init_fn`.
+        '''
+        global _default
+        _default = self
+
+    def _get_lock(self):
+        if self._lock is None and self._lock_state is not None:
+            self._lock = pickle.loads(self._lock_state)
+
+        return self._lock
+
+    def _free_row(self, pid):
+        rows = self._rows
+        free = None
+        for ix in range(_OVERFLOW + 1, self.slots + 1):
+            if rows[ix, _PID] == pid:
+                return ix
+
+            if rows[ix, _PID] == 0 and free is None:
+                free = ix
+
+        if free is not None:
+            return free
+
+        # reclaim rows of exited processes, keeping their counts
+        for ix in range(_OVERFLOW + 1, self.slots + 1):
+            if not _pid_alive(int(rows[ix, _PID])):
+                rows[_OVERFLOW, _CHECKS:] += rows[ix, _CHECKS:]
+                rows[ix] = 0
+                return ix
+
+        return None
+
+    def _claim_row(self, pid):
+        # called with the lock held
+        ix = self._free_row(pid)
+        if ix is None:
+            self._overflow_pid, self._overflow_records = pid, 0
+            return None
+
+        self._rows[ix, _PID] = pid
+        self._row, self._row_pid = self._rows[ix], pid
+        return self._row
+
+    def record(self, ok):
+        # never raises: counting must not break the guarded call
+        if self.closed:
+            return
+
+        pid = os.getpid()
+        if self._row_pid == pid:
+            self._add(self._row, ok)
+            return
+
+        lock = self._get_lock()
+        if lock is None:
+            warnings.warn(f'GuardStats {self.name} has no lock in this '
+                          'process, dropping count')
+            return
+
+        try:
+            with lock:
+                row = None
+                overflowed = self._overflow_pid == pid
+                retry = self._overflow_records % _RECLAIM_EVERY == 0
+                if not overflowed or retry:
+                    row = self._claim_row(pid)
+
+                if row is None:
+                    self._overflow_records += 1
+                    row = self._rows[_OVERFLOW]
+
+                self._add(row, ok)
+        except (OSError, EOFError) as e:
+            warnings.warn(f'GuardStats {self.name} unreachable, dropping '
+                          f'count: {e}')
+
+    @staticmethod
+    def _add(row, ok):
+        row[_CHECKS] += 1
+        if not ok:
+            row[_FAILURES] += 1
+
+    def reset(self):
+        self._live_rows()[:, _CHECKS:] = 0
+
+    def close(self):
+        global _default
+        if self.closed:
+            return
+
+        if _default is self:
+            _default = None
+
+        _attached.pop(self.name, None)
+        self._row = self._rows = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+            if self._manager is not None:
+                self._manager.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _proxy_state(self):
+        if self._lock_state is None and self._owner:
+            self._manager = _LockManager()
+            self._manager.start(_set_server_lock, (self._lock,))
+            # keep the proxy alive so the server keeps the referent
+            self._proxy = self._manager.lock()
+            self._lock_state = pickle.dumps(self._proxy)
+
+        return self._lock_state
+
+    def __reduce__(self):
+        if get_spawning_popen() is not None and self._lock is not None:
+            # process start-up: the semaphore itself can be shipped
+            return (_attach, (self.name, self.slots, self._lock, None))
+
+        return (_attach, (self.name, self.slots, None, self._proxy_state()))
+
+    def __repr__(self):
+        if self.closed:
+            return 'GuardStats(closed)'
+
+        return f'GuardStats(checks={self.checks}, failures={self.failures})'
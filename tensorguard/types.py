@@ -198,6 +198,17 @@ class DType(TensorTypeScalar):
 
         return cls(dtype=ch_name)
 
+_GENERIC_TAG = '__generic'
+_LAZY_FIELDS = {'shape', 'dtype', 'device', 'library', 'props'}
+
+def _freeze_generic(v):
+    # dynamically made TypeVars don't pickle, so store them by name
+    return (_GENERIC_TAG, v.__name__) if isinstance(v, TypeVar) else v
+
+def _thaw_generic(v):
+    is_generic = type(v) is tuple and len(v) == 2 and v[0] == _GENERIC_TAG
+    return TypeVar(v[1]) if is_generic else v
+
 class Tensor:
     def __init__(self, shape=None, dtype=None, device=None, library='torch'):
         self.shape = TensorShape(shape) if shape is not None else shape
@@ -228,6 +239,33 @@ class Tensor:
 
         return Tensor(shape=shape, dtype=dtype, device=device, library=library)
 
+    def __getstate__(self):
+        # only ship the raw spec; the props get rebuilt on first use
+        if 'props' not in self.__dict__:
+            return self._state
+
+        shape = self.shape.shape if self.shape is not None else None
+        state = {k:(v.value if v is not None else None)
+                 for k, v in self.props.items() if k != 'shape'}
+        state['shape'] = None if shape is None else [_freeze_generic(k) for k in shape]
+        state['device'] = _freeze_generic(state['device'])
+        return state
+
+    def __setstate__(self, state):
+        self._state = state
+
+    def __getattr__(self, name):
+        # only reached for the props of an unpickled spec that aren't built yet
+        if name not in _LAZY_FIELDS or '_state' not in self.__dict__:
+            raise AttributeError(name)
+
+        state = dict(self._state)
+        if state['shape'] is not None:
+            state['shape'] = [_thaw_generic(k) for k in state['shape']]
+
+        state['device'] = _thaw_generic(state['device'])
+        self.__init__(**state)
+        return getattr(self, name)
 
     def diff(self, a):
         # calculates type differences between this tensortype and another
@@ -101,3 +101,120 @@ check_bad(f2, (t3, t2))
 from tensorguard import tensorcheck
 tensorcheck([t1], [Tensor([None, None, None, 4])])
 tensorcheck(t1, Tensor([None, None, None, 4])) 
+
+import os
+import pickle
+import multiprocessing as mp
+from tensorguard import GuardStats
+from tensorguard.guard import TensorMismatchError
+
+# specs (including generics) survive a pickle round trip and rebuild lazily
+spec = Tensor(['bs', 3, None], 'float32', 'dev0', None)
+spec2 = pickle.loads(pickle.dumps(spec))
+assert 'props' not in spec2.__dict__
+assert str(spec2) == str(spec)
+tensorcheck(ch.randn(2, 3, 5), spec2)
+
+# guards pickle: by reference at module level, by function otherwise
+f2_2 = pickle.loads(pickle.dumps(f2))
+f2_2(t1, t2)
+check_bad(f2_2, (t3, t2))
+
+def square(a: Tensor(['n', 'n'])):
+    return a
+
+inner = pickle.loads(pickle.dumps(tensorguard(square)))
+inner(ch.randn(3, 3))
+check_bad(inner, ch.randn(3, 4))
+
+def pool_task(guard, spec, ok):
+    # runs in a spawned worker; guard and spec both arrive pickled
+    a = ch.randn(4, 4, 3, 4) if ok else ch.randn(5, 4, 3, 4)
+    try:
+        guard(a, ch.randn(4, 4, 1, 2))
+        passed = True
+    except TensorMismatchError:
+        passed = False
+
+    try:
+        tensorcheck(ch.randn(2, 3), spec)
+        rejected = False
+    except TensorMismatchError:
+        rejected = True
+
+    return os.getpid(), passed, rejected
+
+def indirect_task(ok):
+    # runs in a spawned worker that only got the stats through worker_init
+    a = ch.randn(4, 4, 3, 4) if ok else ch.randn(5, 4, 3, 4)
+    try:
+        f2(a, ch.randn(4, 4, 1, 2))
+        return True
+    except TensorMismatchError:
+        return False
+
+@tensorguard
+def boom(a: Tensor([None, 2])):
+    raise RuntimeError('boom')
+
+def run_pool(stats, n):
+    f2.stats = stats
+    jobs = [(f2, Tensor(['n', 'n']), i % 2 == 0) for i in range(n)]
+    with mp.get_context('spawn').Pool(2) as pool:
+        results = pool.starmap(pool_task, jobs, chunksize=1)
+
+    f2.stats = None
+    assert all(passed == (i % 2 == 0) for i, (_, passed, _) in enumerate(results))
+    assert all(rejected for _, _, rejected in results)
+    return {pid for pid, _, _ in results}
+
+if __name__ == '__main__':
+    # checks and failures from every worker land in the parent; a passing
+    # call counts its argument and return checks, a failing one only the first
+    with GuardStats() as stats:
+        pids = run_pool(stats, 20)
+        assert (stats.checks, stats.failures) == (30, 10), stats
+        assert set(stats.per_process()) == pids, (stats.per_process(), pids)
+
+    # guards called indirectly count once workers install the stats
+    with GuardStats() as stats:
+        ctx = mp.get_context('spawn')
+        with ctx.Pool(2, initializer=stats.worker_init) as pool:
+            results = pool.map(indirect_task, [i % 2 == 0 for i in range(20)])
+
+        assert results == [i % 2 == 0 for i in range(20)]
+        assert (stats.checks, stats.failures) == (30, 10), stats
+
+    # with one row, the second worker spills into the overflow row and the
+    # next pool reclaims the rows of the exited workers
+    with GuardStats(slots=1) as stats:
+        run_pool(stats, 20)
+        run_pool(stats, 20)
+        assert (stats.checks, stats.failures) == (60, 20), stats
+        assert len(stats.per_process()) == 1
+
+    # the argument check counts even if the guarded function raises
+    with GuardStats() as stats:
+        boom.stats = stats
+        try:
+            boom(ch.randn(3, 2))
+        except RuntimeError:
+            pass
+
+        assert (stats.checks, stats.failures) == (1, 0), stats
+        boom.stats = None
+
+    # counting into closed stats is a no-op; reading them is an error
+    with GuardStats() as stats:
+        f2.stats = stats
+        f2(t1, t2)
+        tensorcheck(t1, Tensor([None, None, None, 4]), stats=stats)
+        assert (stats.checks, stats.failures) == (3, 0), stats
+
+    f2(t1, t2)
+    f2.stats = None
+    try:
+        stats.checks
+        raise AssertionError('closed stats should not be readable')
+    except ValueError:
+        pass